@@ -1,3 +1,3 @@
-from .main import BuildError, tminify
+from .main import BuildError, tminify, tminify_batch
 
-__all__ = ["tminify", "BuildError"]
+__all__ = ["tminify", "tminify_batch", "BuildError"]
@@ -0,0 +1,33 @@
+// Minifies HTML for tminify_batch() in a single long-running Node process.
+// Reads newline-delimited JSON jobs {"html": ...} from stdin and writes one
+// JSON result line {"html": ...} or {"error": ...} per job to stdout, in order.
+// Options match the html-minifier-terser CLI flags used by tminify().
+
+const readline = require("node:readline");
+const { minify } = require("html-minifier-terser");
+
+const MINIFY_OPTIONS = {
+  collapseWhitespace: true,
+  removeComments: true,
+  minifyCSS: true,
+  minifyJS: true,
+};
+
+async function main() {
+  const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+  for await (const line of rl) {
+    if (!line.trim()) {
+      continue;
+    }
+    let result;
+    try {
+      const job = JSON.parse(line);
+      result = { html: await minify(job.html, MINIFY_OPTIONS) };
+    } catch (err) {
+      result = { error: String((err && err.stack) || err) };
+    }
+    process.stdout.write(JSON.stringify(result) + "\n");
+  }
+}
+
+main();
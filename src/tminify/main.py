@@ -1,13 +1,16 @@
 import json
 import logging
+import os
 import re
 import shutil
+import string
 import subprocess
 import tempfile
 import time
+from functools import cache, lru_cache
 from pathlib import Path
 from textwrap import indent
-from typing import Any
+from typing import IO, Any
 
 from prettyfmt import fmt_path, fmt_size_dual, fmt_timedelta
 from strif import abbrev_str, atomic_output_file
@@ -19,11 +22,37 @@ log = logging.getLogger(__name__)
 # Regex pattern for matching <style> tags
 STYLE_TAG_PATTERN = r"<style[^>]*>(.*?)</style>"
 
+# Pre-compiled patterns for the Tailwind v4 CDN script and the tags CSS is injected after.
+# These are case-sensitive and must be matched against `_ascii_lower()` text, which is
+# faster than matching with re.I.
+_CDN_RE = re.compile(r'<script[^>]*src=["\'][^"\']*@tailwindcss/browser[^"\']*["\'][^>]*></script>')
+# Bytes version of the CDN pattern, to detect the script before decoding the HTML
+_CDN_BYTES_RE = re.compile(_CDN_RE.pattern.encode("ascii"))
+_HEAD_RE = re.compile(r"(<head[^>]*>)")
+_INJECT_RE = re.compile(r"(<head[^>]*>)|(<html[^>]*>)")
+
+_ASCII_LOWER_TABLE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Directory with package.json, where npm packages are installed at runtime
+JS_DIR = Path(__file__).parent / "javascript"
+
 
 class BuildError(RuntimeError):
     """Raised if any step in the build fails."""
 
 
+def _ascii_lower(text: str) -> str:
+    """
+    Lowercase text for case-insensitive tag matching, keeping match indices aligned
+    with the original text.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few non-ASCII characters change length when lowercased, so lowercase only ASCII
+    return text.translate(_ASCII_LOWER_TABLE)
+
+
 def get_config_js(src_html: Path, preflight: bool) -> str:
     """
     Create Tailwind config as JavaScript module format.
@@ -38,7 +67,7 @@ def get_config_js(src_html: Path, preflight: bool) -> str:
         },
         "plugins": [],
     }
-    return f"module.exports = {json.dumps(config_dict, indent=2)};"
+    return f"module.exports = {json.dumps(config_dict, separators=(',', ':'))};"
 
 
 def get_tailwind_css(html_text: str, src_html: Path) -> str:
@@ -75,9 +104,13 @@ def get_tailwind_css(html_text: str, src_html: Path) -> str:
     return css_content
 
 
-def get_js_dir():
-    """Get the JavaScript directory containing package.json and ensure npm packages are installed."""
-    js_dir = Path(__file__).parent / "javascript"
+@lru_cache(maxsize=1)
+def get_js_dir() -> Path:
+    """
+    Get the JavaScript directory containing package.json and ensure npm packages are installed.
+    Cached since the directory and its installed packages don't change within a process.
+    """
+    js_dir = JS_DIR
     package_json = js_dir / "package.json"
     node_modules = js_dir / "node_modules"
 
@@ -88,7 +121,7 @@ def get_js_dir():
     if not node_modules.exists():
         npm_cmd = ["npm", "install"]
         log.info("Installing npm dependencies...")
-        log.info(f"Running: {' '.join(npm_cmd)}")
+        log.info("Running: %s", " ".join(npm_cmd))
         try:
             subprocess.run(
                 npm_cmd,
@@ -103,11 +136,126 @@ def get_js_dir():
     return js_dir
 
 
+@cache
+def _have_npx() -> bool:
+    """
+    Check if npx is on the PATH. Cached since this walks every PATH directory.
+    """
+    return shutil.which("npx") is not None
+
+
+def _bin(js_dir: Path, name: str) -> str | None:
+    """
+    Get the path to a locally installed npm package binary, if it exists.
+    """
+    bin_name = f"{name}.cmd" if os.name == "nt" else name
+    bin_path = js_dir / "node_modules" / ".bin" / bin_name
+    return str(bin_path) if bin_path.exists() else None
+
+
+def _js_cmd(js_dir: Path, bin_name: str, npx_package: str) -> list[str]:
+    """
+    Command prefix to run an npm package binary. Calls the binary in node_modules
+    directly to avoid npx startup overhead, falling back to npx if it's not installed.
+    """
+    local_bin = _bin(js_dir, bin_name)
+    if local_bin:
+        return [local_bin]
+    return ["npx", npx_package]
+
+
+def _generated_by_comment() -> str:
+    """
+    The generated-by comment added to the end of output, with a leading newline.
+    """
+    return f"\n<!-- generated by {get_version_name()} -->"
+
+
 def add_generated_by_comment(content: str) -> str:
     """
     Add a generated-by comment to the end of the content.
     """
-    return content.rstrip("\n") + f"\n<!-- generated by {get_version_name()} -->"
+    return content.rstrip("\n") + _generated_by_comment()
+
+
+class _BatchMinifier:
+    """
+    Minifies HTML in a single long-running Node process (javascript/batch.js), so
+    Node startup is paid once for many files instead of once per file.
+    Jobs and results are exchanged as newline-delimited JSON over stdin/stdout.
+    """
+
+    def __init__(self, js_dir: Path):
+        if shutil.which("node") is None:
+            raise BuildError("node is not found. Install Node.js and npm first to minify HTML.")
+        batch_cmd = ["node", str(js_dir / "batch.js")]
+        log.info("Running: %s", " ".join(batch_cmd))
+        # Stderr goes to a temp file, not a pipe, so it can't fill up and block the worker
+        self.stderr_file: IO[str] = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+        self.proc: subprocess.Popen[str] = subprocess.Popen(
+            batch_cmd,
+            cwd=js_dir,  # Run in the JavaScript directory with installed packages
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self.stderr_file,
+            encoding="utf-8",
+        )
+
+    def minify(self, html_text: str) -> str:
+        assert self.proc.stdin and self.proc.stdout
+        try:
+            self.proc.stdin.write(json.dumps({"html": html_text}) + "\n")
+            self.proc.stdin.flush()
+        except OSError as e:
+            raise self._exited_error() from e
+        line = self.proc.stdout.readline()
+        if not line:
+            raise self._exited_error()
+        result = json.loads(line)
+        if "error" in result:
+            raise BuildError(f"HTML minification failed:\n{result['error']}")
+        return result["html"]
+
+    def _exited_error(self) -> BuildError:
+        """
+        Wait for the worker to exit after it stopped responding and describe the failure.
+        """
+        try:
+            returncode = self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            returncode = self.proc.wait()
+        self.stderr_file.seek(0)
+        stderr = self.stderr_file.read()
+        log.error("HTML minifier process exited unexpectedly with exit code %s", returncode)
+        if stderr:
+            log.error("HTML minifier stderr: %s", stderr)
+        return BuildError(
+            f"HTML minifier process exited unexpectedly with exit code {returncode}:\n{stderr}"
+        )
+
+    def close(self, kill: bool = False) -> None:
+        """
+        Stop the worker. With `kill`, don't wait for it to finish any job in progress.
+        """
+        try:
+            if kill:
+                self.proc.kill()
+            if self.proc.stdin:
+                try:
+                    self.proc.stdin.close()
+                except OSError:
+                    # The worker already exited, so there is nothing left to flush
+                    pass
+            self.proc.wait()
+        finally:
+            # Never leave the worker running, even if waiting was interrupted
+            if self.proc.poll() is None:
+                self.proc.kill()
+                self.proc.wait()
+            if self.proc.stdout:
+                self.proc.stdout.close()
+            self.stderr_file.close()
 
 
 def tminify(
@@ -139,20 +287,105 @@ def tminify(
         preflight: Whether to enable Tailwind's preflight CSS reset (default: False)
         force_tailwind: Whether to force Tailwind compilation even without CDN script
     """
-    start_time = time.time()
+    _tminify(
+        src_html,
+        dest_html,
+        minify_html=minify_html,
+        preflight=preflight,
+        force_tailwind=force_tailwind,
+    )
 
-    # Get initial file size
-    initial_size = src_html.stat().st_size
 
-    html_text = src_html.read_text()
+def tminify_batch(
+    pairs: list[tuple[Path, Path]],
+    *,
+    minify_html: bool = True,
+    preflight: bool = False,
+    force_tailwind: bool = False,
+):
+    """
+    Process many HTML files, each as with `tminify()`, but minify all of them in a
+    single Node process to avoid paying Node startup for every file. Tailwind is still
+    compiled separately for each file, since each file needs its own CSS.
 
-    # Pattern for Tailwind v4 CDN scripts
-    cdn_pattern = r'<script[^>]*src=["\'][^"\']*@tailwindcss/browser[^"\']*["\'][^>]*></script>'
+    Args:
+        pairs: List of (src_html, dest_html) paths
+        minify_html: Whether to minify the HTML output
+        preflight: Whether to enable Tailwind's preflight CSS reset (default: False)
+        force_tailwind: Whether to force Tailwind compilation even without CDN script
+    """
+    batch_minifier = _BatchMinifier(get_js_dir()) if minify_html else None
+    succeeded = False
+    try:
+        for src_html, dest_html in pairs:
+            _tminify(
+                src_html,
+                dest_html,
+                minify_html=minify_html,
+                preflight=preflight,
+                force_tailwind=force_tailwind,
+                batch_minifier=batch_minifier,
+            )
+        succeeded = True
+    finally:
+        if batch_minifier:
+            # On failure, don't wait for the worker to finish a job in progress
+            batch_minifier.close(kill=not succeeded)
+
+
+def _tminify(
+    src_html: Path,
+    dest_html: Path,
+    *,
+    minify_html: bool,
+    preflight: bool,
+    force_tailwind: bool,
+    batch_minifier: _BatchMinifier | None = None,
+):
+    start_time = time.time()
 
-    tailwind_found = bool(re.search(cdn_pattern, html_text, re.I))
+    # Read the source and get its initial size from a single open file handle
+    with open(src_html, "rb") as f:
+        initial_size = os.fstat(f.fileno()).st_size
+        html_bytes = f.read()
+
+    # Cheap substring check first so documents without the CDN marker skip the regex scan.
+    # Bytes lower() only changes ASCII, which is all the pattern needs.
+    html_bytes_lower = html_bytes.lower()
+    if b"@tailwindcss/browser" not in html_bytes_lower:
+        tailwind_found = False
+    else:
+        tailwind_found = bool(_CDN_BYTES_RE.search(html_bytes_lower))
 
     # Determine if we should compile Tailwind
     should_compile_tailwind = tailwind_found or force_tailwind
+    if not should_compile_tailwind:
+        log.warning("No Tailwind v4 CDN script found, proceeding with standard HTML processing")
+
+    if not should_compile_tailwind and not minify_html:
+        # Nothing to compile or minify, so write the source bytes straight through
+        # without decoding and re-encoding them
+        # Match text-mode read and write: normalize line endings, then use the platform's
+        out_bytes = html_bytes.replace(b"\r\n", b"\n").replace(b"\r", b"\n").rstrip(b"\n")
+        out_bytes += _generated_by_comment().encode("utf-8")
+        if os.linesep != "\n":
+            out_bytes = out_bytes.replace(b"\n", os.linesep.encode("ascii"))
+        with atomic_output_file(dest_html) as dest_temp:
+            dest_temp.write_bytes(out_bytes)
+        _log_summary(
+            dest_html,
+            initial_size=initial_size,
+            start_time=start_time,
+            should_compile_tailwind=False,
+            minify_html=False,
+        )
+        return
+
+    # Normalize line endings as text-mode reads do, so CRLF sources give the same output
+    html_text = html_bytes.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+    # JavaScript directory, looked up once for both Tailwind and minification
+    js_dir: Path | None = None
 
     if should_compile_tailwind:
         if tailwind_found:
@@ -160,7 +393,8 @@ def tminify(
         else:
             log.warning("Forcing Tailwind CSS compilation (--tailwind flag used)")
 
-        if shutil.which("npx") is None:
+        # npx is only needed if the Tailwind CLI isn't already installed locally
+        if _bin(JS_DIR, "tailwindcss") is None and not _have_npx():
             raise BuildError(
                 "npx is not found. Install Node.js and npm first to compile Tailwind CSS."
             )
@@ -170,17 +404,16 @@ def tminify(
         # Get CSS content for Tailwind compilation
         input_css_content = get_tailwind_css(html_text, src_html)
 
-        # Create temp directory adjacent to destination file
+        # Create temp directory adjacent to destination file for the Tailwind config
         with tempfile.TemporaryDirectory(dir=dest_html.parent) as tmpdir:
             tmp_path = Path(tmpdir)
-            output_css = tmp_path / "tailwind.min.css"
 
             # Create temporary tailwind config that scans the input HTML
             temp_config = tmp_path / "tailwind.config.js"
 
             # Create config for Tailwind
             config_js = get_config_js(src_html, preflight)
-            temp_config.write_text(config_js)
+            temp_config.write_bytes(config_js.encode("utf-8"))
 
             log.info(
                 "Tailwind input CSS:\n%s",
@@ -190,102 +423,107 @@ def tminify(
 
             # Use stdin to avoid import resolution issues
             tailwind_cmd = [
-                "npx",
-                "@tailwindcss/cli",
+                *_js_cmd(js_dir, "tailwindcss", "@tailwindcss/cli"),
                 "--input",
                 "-",  # Read from stdin
                 "--output",
-                str(output_css.absolute()),
+                "-",  # Write compiled CSS to stdout
                 "--config",
                 str(temp_config.absolute()),
                 "--minify",
             ]
-            log.info(f"Running: {' '.join(tailwind_cmd)}")
+            log.info("Running: %s", " ".join(tailwind_cmd))
+            # Start Tailwind in the background so Node startup overlaps the HTML scan below
+            proc = subprocess.Popen(
+                tailwind_cmd,
+                cwd=js_dir,  # Run from js_dir where node_modules exists
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                encoding="utf-8",
+            )
             try:
-                result = subprocess.run(
-                    tailwind_cmd,
-                    cwd=js_dir,  # Run from js_dir where node_modules exists
-                    input=input_css_content,  # Provide CSS via stdin
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-                if result.stdout:
-                    log.info(f"Tailwind output: {result.stdout}")
-                if result.stderr:
-                    log.info(f"Tailwind stderr: {result.stderr}")
-            except subprocess.CalledProcessError as e:
-                log.error(f"Tailwind command failed with exit code {e.returncode}")
-                if e.stdout:
-                    log.error(f"Tailwind stdout: {e.stdout}")
-                if e.stderr:
-                    log.error(f"Tailwind stderr: {e.stderr}")
-                raise BuildError(f"Tailwind CSS v4 build failed:\n{e.stderr}") from e
-
-            css_text = output_css.read_text()
-
-        # Remove all existing <style> tags before injecting compiled CSS
-        processed_html = re.sub(STYLE_TAG_PATTERN, "", html_text, flags=re.DOTALL | re.I)
-
-        if tailwind_found:
+                # Remove all existing <style> tags before injecting compiled CSS
+                processed_html = re.sub(STYLE_TAG_PATTERN, "", html_text, flags=re.DOTALL | re.I)
+
+                # Find the CDN script to replace or, if no CDN script found, where to inject
+                # CSS into <head>: find <head> or <html> in one scan, continuing past <html>
+                # to look for <head>
+                # Matches are on lowercased text but indices are used to splice the original
+                processed_lower = _ascii_lower(processed_html)
+                cdn_match = head_end = html_end = None
+                if tailwind_found:
+                    cdn_match = _CDN_RE.search(processed_lower)
+                # The CDN script may only have matched inside a removed <style> tag
+                if not cdn_match:
+                    tag_match = _INJECT_RE.search(processed_lower)
+                    if tag_match and tag_match.group(1):
+                        head_end = tag_match.end()
+                    elif tag_match:
+                        html_end = tag_match.end()
+                        head_match = _HEAD_RE.search(processed_lower, html_end)
+                        if head_match:
+                            head_end = head_match.end()
+
+                # Provide CSS via stdin and wait for Tailwind to finish
+                tailwind_stdout, tailwind_stderr = proc.communicate(input=input_css_content)
+            except BaseException:
+                proc.kill()
+                proc.wait()
+                raise
+
+            if proc.returncode != 0:
+                log.error("Tailwind command failed with exit code %s", proc.returncode)
+                if tailwind_stdout:
+                    log.error("Tailwind stdout: %s", tailwind_stdout)
+                if tailwind_stderr:
+                    log.error("Tailwind stderr: %s", tailwind_stderr)
+                raise BuildError(f"Tailwind CSS v4 build failed:\n{tailwind_stderr}")
+            if tailwind_stderr:
+                log.info("Tailwind stderr: %s", tailwind_stderr)
+
+        css_text = tailwind_stdout
+        log.info("Tailwind output CSS size: %s", fmt_size_dual(len(css_text)))
+
+        if cdn_match:
             # Replace Tailwind CDN script with compiled CSS
-            processed_html = re.sub(
-                cdn_pattern,
-                f"<style>{css_text}</style>",
-                processed_html,
-                count=1,
-                flags=re.I,
-            )
+            start, end = cdn_match.start(), cdn_match.end()
+            open_tags, close_tags = "<style>", "</style>"
+        elif head_end is not None:
+            # Insert after opening <head> tag
+            start = end = head_end
+            open_tags, close_tags = "<style>", "</style>"
+        elif html_end is not None:
+            # No <head> tag, add one with the CSS
+            start = end = html_end
+            open_tags, close_tags = "<head><style>", "</style></head>"
         else:
-            # No CDN script found, inject CSS into <head>
-            head_pattern = r"(<head[^>]*>)"
-            if re.search(head_pattern, processed_html, re.I):
-                # Insert after opening <head> tag
-                processed_html = re.sub(
-                    head_pattern,
-                    rf"\1<style>{css_text}</style>",
-                    processed_html,
-                    count=1,
-                    flags=re.I,
-                )
-            else:
-                # No <head> tag, add one with the CSS
-                processed_html = re.sub(
-                    r"(<html[^>]*>)",
-                    rf"\1<head><style>{css_text}</style></head>",
-                    processed_html,
-                    count=1,
-                    flags=re.I,
-                )
-                # If no <html> tag either, just prepend to the beginning
-                if not re.search(r"<html[^>]*>", processed_html, re.I):
-                    processed_html = f"<head><style>{css_text}</style></head>{processed_html}"
+            # If no <html> tag either, just prepend to the beginning
+            start = end = 0
+            open_tags, close_tags = "<head><style>", "</style></head>"
+
+        # Join the pieces in one pass so large CSS and HTML are copied only once
+        processed_html = "".join(
+            [processed_html[:start], open_tags, css_text, close_tags, processed_html[end:]]
+        )
 
         log.info("Tailwind CSS v4 compiled and inlined successfully")
     else:
-        log.warning("No Tailwind v4 CDN script found, proceeding with standard HTML processing")
         processed_html = html_text
 
     with atomic_output_file(dest_html) as dest_temp:
-        if minify_html:
+        if minify_html and batch_minifier:
+            log.info("Minifying HTML (including inline CSS and JS) in batch process...")
+            minified_content = batch_minifier.minify(processed_html)
+            dest_temp.write_text(add_generated_by_comment(minified_content), encoding="utf-8")
+        elif minify_html:
             log.info("Minifying HTML (including inline CSS and JS)...")
 
-            js_dir = get_js_dir()
-
-            # Write processed HTML to a temp file for html-minifier-terser
-            with tempfile.NamedTemporaryFile(
-                mode="w",
-                prefix=dest_html.stem,
-                suffix=".html",
-                delete=False,
-                dir=dest_html.parent,
-            ) as tmp_file:
-                tmp_file.write(processed_html)
-                tmp_html_path = tmp_file.name
+            if js_dir is None:
+                js_dir = get_js_dir()
 
             minifier_cmd = [
-                "npx",
-                "html-minifier-terser",
+                *_js_cmd(js_dir, "html-minifier-terser", "html-minifier-terser"),
                 "--collapse-whitespace",
                 "--remove-comments",
                 "--minify-css",
@@ -294,45 +532,62 @@ def tminify(
                 "true",
                 "-o",
                 str(dest_temp.absolute()),
-                tmp_html_path,
             ]
-            log.info(f"Running: {' '.join(minifier_cmd)}")
+            log.info("Running: %s", " ".join(minifier_cmd))
             try:
                 result = subprocess.run(
                     minifier_cmd,
                     cwd=js_dir,  # Run in the JavaScript directory with installed packages
+                    input=processed_html,  # Provide HTML via stdin
                     check=True,
                     capture_output=True,
-                    text=True,
+                    encoding="utf-8",
                 )
                 if result.stdout:
-                    log.info(f"HTML minifier output: {result.stdout}")
+                    log.info("HTML minifier output: %s", result.stdout)
                 if result.stderr:
-                    log.info(f"HTML minifier stderr: {result.stderr}")
+                    log.info("HTML minifier stderr: %s", result.stderr)
             except subprocess.CalledProcessError as e:
-                log.error(f"HTML minifier command failed with exit code {e.returncode}")
+                log.error("HTML minifier command failed with exit code %s", e.returncode)
                 if e.stdout:
-                    log.error(f"HTML minifier stdout: {e.stdout}")
+                    log.error("HTML minifier stdout: %s", e.stdout)
                 if e.stderr:
-                    log.error(f"HTML minifier stderr: {e.stderr}")
+                    log.error("HTML minifier stderr: %s", e.stderr)
                 raise BuildError(f"HTML minification failed:\n{e.stderr}") from e
-            finally:
-                # Clean up temp file
-                Path(tmp_html_path).unlink(missing_ok=True)
 
             # Add generated-by comment after minification
-            minified_content = dest_temp.read_text()
-            dest_temp.write_text(add_generated_by_comment(minified_content))
+            minified_content = dest_temp.read_text(encoding="utf-8")
+            dest_temp.write_text(add_generated_by_comment(minified_content), encoding="utf-8")
         else:
-            dest_temp.write_text(add_generated_by_comment(processed_html))
+            dest_temp.write_text(add_generated_by_comment(processed_html), encoding="utf-8")
+
+    _log_summary(
+        dest_html,
+        initial_size=initial_size,
+        start_time=start_time,
+        should_compile_tailwind=should_compile_tailwind,
+        minify_html=minify_html,
+    )
+
 
+def _log_summary(
+    dest_html: Path,
+    *,
+    initial_size: int,
+    start_time: float,
+    should_compile_tailwind: bool,
+    minify_html: bool,
+):
+    """
+    Log where the output was written and a concise size and timing summary.
+    """
     if minify_html:
-        log.info(f"HTML minified and written: {fmt_path(dest_html)}")
+        log.info("HTML minified and written: %s", fmt_path(dest_html))
     else:
-        log.info(f"HTML written (no minification): {fmt_path(dest_html)}")
+        log.info("HTML written (no minification): %s", fmt_path(dest_html))
 
     # Get final file size and print statistics
-    final_size = dest_html.stat().st_size
+    final_size = os.path.getsize(dest_html)
 
     # Print concise summary
     actions: list[str] = []
@@ -349,6 +604,10 @@ def tminify(
 
     elapsed_time = time.time() - start_time
     log.warning(
-        f"{action_str}: {fmt_size_dual(initial_size)} → {fmt_size_dual(final_size)}{pct_str}"
-        f" in {fmt_timedelta(elapsed_time, brief=True)}"
+        "%s: %s → %s%s in %s",
+        action_str,
+        fmt_size_dual(initial_size),
+        fmt_size_dual(final_size),
+        pct_str,
+        fmt_timedelta(elapsed_time, brief=True),
     )
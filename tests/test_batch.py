@@ -0,0 +1,77 @@
+import tempfile
+from pathlib import Path
+from textwrap import dedent
+
+from tminify import tminify, tminify_batch
+
+
+def test_tminify_batch():
+    """Batch minification of several files with one Node process, including Tailwind."""
+
+    pages = {
+        "first.html": dedent("""
+            <!DOCTYPE html>
+            <html>
+            <head><title>First</title></head>
+            <body>
+                <!-- This comment should be removed -->
+                <p>First page</p>
+            </body>
+            </html>
+        """).strip(),
+        "second.html": dedent("""
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <style>
+                    body { margin: 0; padding: 20px; }
+                </style>
+            </head>
+            <body>
+                <p>Second page</p>
+            </body>
+            </html>
+        """).strip(),
+        "tailwind.html": dedent("""
+            <!DOCTYPE html>
+            <html lang="en">
+            <head>
+                <title>Tailwind</title>
+                <script src="https://cdn.jsdelivr.net/npm/@tailwindcss/browser@4"></script>
+            </head>
+            <body>
+                <div class="bg-blue-500 text-white p-4">Tailwind page</div>
+            </body>
+            </html>
+        """).strip(),
+    }
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pairs: list[tuple[Path, Path]] = []
+        for name, html in pages.items():
+            input_file = Path(tmpdir) / name
+            input_file.write_text(html)
+            pairs.append((input_file, Path(tmpdir) / f"out_{name}"))
+
+        tminify_batch(pairs)
+
+        first_output = pairs[0][1].read_text()
+        assert "<!-- This comment should be removed -->" not in first_output
+        assert "<p>First page</p>" in first_output
+        assert "<!-- generated by tminify" in first_output
+
+        second_output = pairs[1][1].read_text()
+        assert "margin:0" in second_output  # CSS should be minified
+        assert "<p>Second page</p>" in second_output
+
+        tailwind_output = pairs[2][1].read_text()
+        assert "@tailwindcss/browser" not in tailwind_output
+        assert "<style>" in tailwind_output
+        assert "tailwindcss" in tailwind_output
+        assert "bg-blue-500" in tailwind_output
+
+        # Batch output should match processing each file on its own
+        for src_html, dest_html in pairs:
+            single_output = Path(tmpdir) / f"single_{src_html.name}"
+            tminify(src_html, single_output)
+            assert dest_html.read_text() == single_output.read_text()
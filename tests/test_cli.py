@@ -4,6 +4,8 @@ import tempfile
 from pathlib import Path
 from textwrap import dedent
 
+from tminify.version import get_version_name
+
 
 def run_minify_cli(
     input_file: Path, output_file: Path, *flags: str
@@ -477,3 +479,56 @@ def test_cli_comprehensive():
             assert len(output_content.split("\n")) <= 3  # Minified but may contain doctype+comment
 
             print("Modern Tailwind example with @apply directives test passed!")
+
+    # Test case 13: Uppercase tags and non-ASCII text that changes length when lowercased
+    uppercase_html = dedent("""
+        <!DOCTYPE html>
+        <HTML lang="tr">
+        <!-- İstanbul İzmir -->
+        <HEAD>
+            <TITLE>Uppercase Tags</TITLE>
+        </HEAD>
+        <BODY>
+            <div class="bg-red-500 p-4">İ before and after the head</div>
+        </BODY>
+        </HTML>
+    """).strip()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        input_file = Path(tmpdir) / "uppercase.html"
+        output_file = Path(tmpdir) / "uppercase_output.html"
+
+        input_file.write_text(uppercase_html, encoding="utf-8")
+
+        result = run_minify_cli(input_file, output_file, "--tailwind", "--no_minify", "--verbose")
+
+        assert result.returncode == 0
+        assert "Forcing Tailwind CSS compilation" in result.stderr
+
+        output_content = output_file.read_text(encoding="utf-8")
+        # CSS must be spliced right after the original-case <HEAD>, with nothing shifted
+        assert "<HEAD><style>" in output_content
+        assert "<!-- İstanbul İzmir -->\n<HEAD><style>" in output_content
+        assert "</style>\n    <TITLE>Uppercase Tags</TITLE>" in output_content
+        assert "İ before and after the head" in output_content
+
+    # Test case 14: No Tailwind and no minification writes the source through unchanged
+    plain_crlf_html = "<!DOCTYPE html>\r\n<html>\r\n<head><title>Plain</title></head>\r\n<body>\r\n    <p>Line one\rLine two</p>\r\n</body>\r\n</html>\r\n\r\n"
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        input_file = Path(tmpdir) / "plain_crlf.html"
+        output_file = Path(tmpdir) / "plain_crlf_output.html"
+
+        input_file.write_bytes(plain_crlf_html.encode("utf-8"))
+
+        result = run_minify_cli(input_file, output_file, "--no_minify", "--verbose")
+
+        assert result.returncode == 0
+        assert "No Tailwind v4 CDN script found" in result.stderr
+        assert result.stderr.count("No Tailwind v4 CDN script found") == 1
+        assert "Tailwind CSS compiled" not in result.stderr
+
+        # Line endings are normalized to LF, trailing newlines dropped, and the comment added
+        expected_html = plain_crlf_html.replace("\r\n", "\n").replace("\r", "\n").rstrip("\n")
+        expected_bytes = f"{expected_html}\n<!-- generated by {get_version_name()} -->".encode()
+        assert output_file.read_bytes() == expected_bytes